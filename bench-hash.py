@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'Markus Thilo'
+__version__ = '0.0.1_2024-09-02'
+__license__ = 'GPL-3'
+__email__ = 'markus.thilo@gmail.com'
+__status__ = 'Testing'
+__description__ = 'Benchmark hashing of small and large files, readinto buffers and mmap against the old read() loop'
+
+from os import urandom
+from pathlib import Path
+from hashlib import sha256
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from argparse import ArgumentParser
+### Custom libs ###
+from lib.pathutils import PathUtils
+
+def hash_read(path):
+	'''Hash file the way it was done before: new bytes object for every 64 KiB block'''
+	sha = sha256()
+	with path.open('rb') as fh:
+		while True:
+			block = fh.read(PathUtils.BLOCK_SIZE)
+			if not block:
+				break
+			sha.update(block)
+	return sha.hexdigest()
+
+def measure(function, paths, runs):
+	'''Hash all files runs times, return fastest time in seconds'''
+	times = list()
+	for run_number in range(runs):
+		start = perf_counter()
+		for path in paths:
+			function(path)
+		times.append(perf_counter() - start)
+	return min(times)
+
+if __name__ == '__main__':	# start here
+	argparser = ArgumentParser(description=__description__)
+	argparser.add_argument('-d', '--dir', type=Path,
+		help='Directory to write test files to (default: temporary directory)', metavar='DIRECTORY')
+	argparser.add_argument('-n', '--number', type=int, default=2000,
+		help='Number of small files', metavar='INTEGER')
+	argparser.add_argument('-s', '--small', type=int, default=20000,
+		help='Size of each small file in bytes', metavar='INTEGER')
+	argparser.add_argument('-l', '--large', type=int, default=256*2**20,
+		help='Size of the large file in bytes', metavar='INTEGER')
+	argparser.add_argument('-r', '--runs', type=int, default=5,
+		help='Runs per method, the fastest counts (warm cache)', metavar='INTEGER')
+	args = argparser.parse_args()
+	with TemporaryDirectory(dir=args.dir) as tmp_dir:
+		small_paths = list()
+		for number in range(args.number):
+			path = Path(tmp_dir) / f'{number}.bin'
+			path.write_bytes(urandom(args.small))
+			small_paths.append(path)
+		large_path = Path(tmp_dir) / 'large.bin'
+		with large_path.open('wb') as fh:
+			for offset in range(0, args.large, 2**20):
+				fh.write(urandom(min(2**20, args.large - offset)))
+		methods = (
+			('read() loop (as before)', hash_read),
+			('readinto, auto block size', PathUtils.hash_file),
+			(f'readinto, {PathUtils.BLOCK_SIZE // 1024} KiB blocks',
+				lambda path: PathUtils.hash_file(path, block_size=PathUtils.BLOCK_SIZE)),
+			('readinto or mmap (use_mmap=True)', lambda path: PathUtils.hash_file(path, use_mmap=True))
+		)
+		if len({function(large_path) for name, function in methods}) != 1:
+			raise RuntimeError('Methods give different hashes')
+		for name, function in methods:
+			small = measure(function, small_paths, args.runs)
+			large = measure(function, [large_path], args.runs)
+			print(f'{name}: {args.number} x {args.small} Bytes {small:.3f} s, 1 x {args.large} Bytes {large:.3f} s')
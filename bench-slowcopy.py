@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'Markus Thilo'
+__version__ = '0.0.1_2024-09-02'
+__license__ = 'GPL-3'
+__email__ = 'markus.thilo@gmail.com'
+__status__ = 'Testing'
+__description__ = 'Measure startup time of SlowCopy on the command line, give built executables as arguments to compare'
+
+from sys import executable, argv as sys_argv
+from pathlib import Path
+from subprocess import run, DEVNULL
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+RUNS = 10	# number of launches per command
+
+def startup(cmd, cwd):
+	'''Launch command RUNS times, return fastest and mean time in seconds'''
+	times = list()
+	for run_number in range(RUNS):
+		start = perf_counter()
+		run(cmd, cwd=cwd, stdout=DEVNULL, stderr=DEVNULL)
+		times.append(perf_counter() - start)
+	return min(times), sum(times) / RUNS
+
+if __name__ == '__main__':	# start here
+	cwd_path = Path(__file__).parent
+	with TemporaryDirectory() as tmp_dir:
+		missing_path = Path(tmp_dir) / 'missing'	# slowcopy exits right after startup on this
+		commands = [
+			('python slowcopy.py (cli)', [executable, f'{cwd_path / "slowcopy.py"}', f'{missing_path}']),
+			('python cli + gui imports (as before)', [executable, '-c', 'import lib.slowcopygui, slowcopy'])
+		] + [(exe, [exe, f'{missing_path}']) for exe in sys_argv[1:]]
+		for name, cmd in commands:
+			fastest, mean = startup(cmd, cwd_path)
+			print(f'{name}: fastest {fastest*1000:.0f} ms, mean {mean*1000:.0f} ms')
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = 'Markus Thilo'
+__version__ = '0.0.1_2024-09-02'
+__license__ = 'GPL-3'
+__email__ = 'markus.thilo@gmail.com'
+__status__ = 'Testing'
+__description__ = 'Benchmark copy and check on simulated slow and faulty storage'
+
+from os import urandom
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import SimpleNamespace
+from argparse import ArgumentParser
+### Custom libs ###
+from lib.pathutils import PathUtils
+from lib.storageshim import StorageShim
+import surveillance
+
+def build_source(root, quantity, size):
+	'''Generate files with random content, return relative paths'''
+	rel_paths = list()
+	for number in range(quantity):
+		rel_path = Path(f'{number % 10}') / f'{number}.bin'
+		root.joinpath(rel_path.parent).mkdir(exist_ok=True)
+		root.joinpath(rel_path).write_bytes(urandom(size))
+		rel_paths.append(rel_path)
+	return rel_paths
+
+def copy(src_root, dst_root, rel_paths):
+	'''Copy all files, return hashes and number of errors'''
+	hashes = dict()
+	errors = 0
+	for rel_path in rel_paths:
+		try:
+			dst_root.joinpath(rel_path.parent).mkdir(parents=True, exist_ok=True)
+			hash, backend = PathUtils.copy_file(src_root / rel_path, dst_root / rel_path)
+		except OSError:
+			errors += 1
+		else:
+			hashes[rel_path] = hash
+	return hashes, errors
+
+def check(root, sizes, hashes, threads):
+	'''Run Directory.check of surveillance, return number of warnings'''
+	surveillance.config = SimpleNamespace(check_threads=threads, check_extras=False)
+	return surveillance.Directory(root).check(sizes, hashes)
+
+if __name__ == '__main__':	# start here
+	argparser = ArgumentParser(description=__description__)
+	argparser.add_argument('-n', '--number', type=int, default=200,
+		help='Number of files', metavar='INTEGER')
+	argparser.add_argument('-s', '--size', type=int, default=2**16,
+		help='Size of each file in bytes', metavar='INTEGER')
+	argparser.add_argument('-l', '--latency', type=float, default=[0, 1, 5], nargs='+',
+		help='Latencies per operation in milliseconds', metavar='FLOAT')
+	argparser.add_argument('-b', '--bandwidth', type=int,
+		help='Bandwidth in bytes per second', metavar='INTEGER')
+	argparser.add_argument('-e', '--errors', type=float, default=0.01,
+		help='Probability of I/O errors, short reads and vanished files in fault run', metavar='FLOAT')
+	args = argparser.parse_args()
+	with TemporaryDirectory() as tmp_dir:
+		src_path = Path(tmp_dir) / 'src'
+		src_path.mkdir()
+		rel_paths = build_source(src_path, args.number, args.size)
+		sizes = {rel_path: args.size for rel_path in rel_paths}
+		for latency in args.latency:
+			dst_path = Path(tmp_dir) / f'dst_{latency}'
+			with StorageShim(tmp_dir, latency=latency/1000, bandwidth=args.bandwidth) as shim:
+				start = perf_counter()
+				hashes, errors = copy(src_path, dst_path, rel_paths)
+				copy_time = perf_counter() - start
+				timings = list()
+				for threads in (1, 16):
+					start = perf_counter()
+					check(dst_path, sizes, hashes, threads)
+					timings.append(f'check with {threads} thread(s) {perf_counter() - start:.2f} s')
+			print(f'{latency} ms latency: copy {copy_time:.2f} s, {", ".join(timings)}, {shim.operations} operations')
+		dst_path = Path(tmp_dir) / 'dst_faults'
+		with StorageShim(tmp_dir, short_reads=args.errors, errors=args.errors, vanish=args.errors, seed=0):
+			hashes, errors = copy(src_path, dst_path, rel_paths)
+			try:
+				warnings = check(dst_path, sizes, hashes, 16)
+			except OSError as ex:
+				warnings = f'aborted ({ex})'
+		print(f'Fault injection: {errors} copy error(s), {len(hashes)} copied, check warnings: {warnings}')
@@ -40,4 +40,4 @@ class Logger:
 	def close(self):
 		'''Close logfile'''
 		self._fh.close()
-		return self.warnings + self.warnings > 0
+		return self.warnings + self.errors > 0
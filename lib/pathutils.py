@@ -3,12 +3,71 @@
 
 from pathlib import Path
 from hashlib import sha256
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+from posixpath import relpath, dirname
+from stat import S_IFLNK
+from time import localtime
+from mmap import mmap, ACCESS_READ
+from threading import local
+from sys import platform
+from errno import EXDEV, ENOSYS, EOPNOTSUPP, ENOTSUP, EINVAL, ENOTTY, EBADF, ENOTSOCK
+try:	# kernel copy functions are not available on every os
+	from os import copy_file_range
+except ImportError:
+	copy_file_range = None
+try:
+	from os import sendfile
+except ImportError:
+	sendfile = None
+if not platform.startswith('linux'):	# macos and bsd can only sendfile to sockets
+	sendfile = None
+try:
+	from fcntl import ioctl
+except ImportError:
+	ioctl = None
+if not platform.startswith('linux'):	# FICLONE is a linux ioctl number
+	ioctl = None
 
 class PathUtils:
 	'''Some functions for pathlib's Path class'''
 
-	BLOCK_SIZE = sha256().block_size * 1024
+	BLOCK_SIZE = sha256().block_size * 1024	# default and minimal block size (64 KiB)
+	MAX_BLOCK_SIZE = 16 * 2**20	# upper limit for auto-tuned block size (16 MiB)
+	MMAP_THRESHOLD = 64 * 2**20	# with use_mmap hash files of this size or larger via mmap, None to disable
+	_buffers = local()	# reusable read buffers, one per thread
+	COPY_BACKENDS = ('reflink', 'copy_file_range', 'sendfile', 'buffered')	# try to copy in this order
+	FICLONE = 0x40049409	# linux ioctl to clone a file (reflink) on btrfs, xfs etc.
+	FALLBACK_ERRNOS = {EXDEV, ENOSYS, EOPNOTSUPP, ENOTSUP, EINVAL, ENOTTY, EBADF, ENOTSOCK}	# backend not usable
+	ZIP_LINK_ATTR = (S_IFLNK | 0o777) << 16	# external attributes of zip member that is a symbolic link
+
+	@staticmethod
+	def block_size(size, block_size=None):
+		'''Return given block size or auto-tune it by file size, bigger files get bigger blocks'''
+		if block_size:
+			return block_size
+		auto_size = PathUtils.BLOCK_SIZE
+		while auto_size < PathUtils.MAX_BLOCK_SIZE and auto_size * 64 < size:
+			auto_size *= 2
+		return auto_size
+
+	@staticmethod
+	def get_buffer(block_size):
+		'''Return preallocated buffer (memoryview) of this thread, grow if it is too small'''
+		buffer = getattr(PathUtils._buffers, 'view', None)
+		if not buffer or len(buffer) < block_size:
+			buffer = memoryview(bytearray(block_size))
+			PathUtils._buffers.view = buffer
+		return buffer[:block_size]
+
+	@staticmethod
+	def read_blocks(fh, block_size):
+		'''Read file handler into reusable buffer, yield filled part of the buffer'''
+		buffer = PathUtils.get_buffer(block_size)
+		while True:
+			length = fh.readinto(buffer)
+			if not length:
+				break
+			yield buffer[:length]
 
 	@staticmethod
 	def get_subdirs(root):
@@ -46,54 +105,174 @@ class PathUtils:
 		return dirs, files
 
 	@staticmethod
-	def hash_file(path):
-		'''Calculate SHA256 from file'''
+	def hash_file(path, block_size=None, use_mmap=False):
+		'''Calculate SHA256 from file,
+			use_mmap only for files on local disks that will not change while hashing -
+			a truncated file or a failing network share kills the process (SIGBUS) instead of raising OSError
+		'''
 		sha = sha256()
-		with path.open('rb') as fh:
-			while True:
-				block = fh.read(PathUtils.BLOCK_SIZE)
-				if not block:
-					break
+		with path.open('rb', buffering=0) as fh:
+			size = path.stat().st_size
+			if use_mmap and PathUtils.MMAP_THRESHOLD and size >= PathUtils.MMAP_THRESHOLD:
+				try:	# let the os page in the file, no copy to python buffers
+					with mmap(fh.fileno(), 0, access=ACCESS_READ) as mm:
+						sha.update(mm)
+					return sha.hexdigest()
+				except (OSError, ValueError):	# e.g. file system does not support mmap
+					fh.seek(0)
+			for block in PathUtils.read_blocks(fh, PathUtils.block_size(size, block_size=block_size)):
 				sha.update(block)
 		return sha.hexdigest()
 
 	@staticmethod
-	def hash_zip(zipfile, path):
-		'''Calculate SHA256 from file in ZIP archive'''
+	def hash_stream(fh, size, block_size=None):
+		'''Calculate SHA256 from opened file like object with readinto'''
 		sha = sha256()
-		with zipfile.open(path.as_posix()) as fh:
-			while True:
-				block = fh.read(PathUtils.BLOCK_SIZE)
-				if not block:
-					break
+		with fh:
+			for block in PathUtils.read_blocks(fh, PathUtils.block_size(size, block_size=block_size)):
 				sha.update(block)
 		return sha.hexdigest()
 
 	@staticmethod
-	def copy_file(src, dst):
-		'''Copy one file and calculate shaes, return sha on success'''
-		sha = sha256()
-		with src.open('rb') as sfh, dst.open('wb') as dfh:
-			while True:
-				block = sfh.read(PathUtils.BLOCK_SIZE)
-				if not block:
+	def hash_zip(zipfile, path, block_size=None):
+		'''Calculate SHA256 from file in ZIP archive'''
+		size = zipfile.getinfo(path.as_posix()).file_size
+		return PathUtils.hash_stream(zipfile.open(path.as_posix()), size, block_size=block_size)
+
+	@staticmethod
+	def kernel_copy(backend, sfh, dfh, size):
+		'''Copy without python buffers, return False and reset destination if backend is not usable'''
+		try:
+			if backend == 'reflink' and ioctl:	# share data blocks, nothing is copied at all
+				ioctl(dfh.fileno(), PathUtils.FICLONE, sfh.fileno())
+				return True
+			if backend == 'copy_file_range' and copy_file_range:
+				offset = 0
+				while offset < size:
+					copied = copy_file_range(sfh.fileno(), dfh.fileno(), size - offset, offset, offset)
+					if not copied:	# some file systems (fuse, overlay, proc) return 0 instead of raising
+						break
+					offset += copied
+				else:
+					return True
+			elif backend == 'sendfile' and sendfile:
+				offset = 0
+				while offset < size:
+					sent = sendfile(dfh.fileno(), sfh.fileno(), offset, size - offset)
+					if not sent:
+						break
+					offset += sent
+				else:
+					return True
+		except OSError as ex:
+			if not ex.errno in PathUtils.FALLBACK_ERRNOS:
+				raise
+		dfh.seek(0)	# remove what might have been written before the backend gave up
+		dfh.truncate()
+		return False
+
+	@staticmethod
+	def copy_file(src, dst, block_size=None, backends=None, use_mmap=False):
+		'''Copy one file and calculate shaes, return sha on success and the used backend,
+			use_mmap to hash the copy via mmap (only on local disks, see hash_file)
+		'''
+		size = src.stat().st_size
+		block_size = PathUtils.block_size(size, block_size=block_size)
+		backend = 'buffered'
+		with src.open('rb', buffering=0) as sfh, dst.open('wb', buffering=0) as dfh:
+			for kernel_backend in backends or PathUtils.COPY_BACKENDS:	# try fast paths first
+				if kernel_backend == 'buffered':
 					break
-				dfh.write(block)
+				if PathUtils.kernel_copy(kernel_backend, sfh, dfh, size):
+					backend = kernel_backend
+					break
+			if backend == 'buffered':	# fall back to copy through python
+				sha = sha256()
+				for block in PathUtils.read_blocks(sfh, block_size):
+					sha.update(block)
+					while block:	# unbuffered write might be partial
+						block = block[dfh.write(block):]
+		if backend == 'buffered':
+			src_sha = sha.hexdigest()
+			if PathUtils.hash_file(dst, block_size=block_size, use_mmap=use_mmap) == src_sha:
+				return src_sha, backend
+		elif dst.stat().st_size == size:	# data did not pass userspace, so read source once to hash
+			return PathUtils.hash_file(src, block_size=block_size), backend
+		return None, backend
+
+	@staticmethod
+	def fan_out(src, writers, executor=None, block_size=None):
+		'''Read file once and write it to all writers (opened file like objects),
+			return sha and list with exception (or None) per writer, failing writers get no more data
+		'''
+		sha = sha256()
+		errors = [None] * len(writers)
+		def write(index, block):	# intern function to catch errors per writer
+			try:
+				writers[index].write(block)
+			except Exception as ex:
+				errors[index] = ex
+		with src.open('rb', buffering=0) as fh:
+			for block in PathUtils.read_blocks(fh, PathUtils.block_size(src.stat().st_size, block_size=block_size)):
+				active = [index for index, error in enumerate(errors) if not error]
+				if executor and len(active) > 1:	# write concurrently while hashing
+					futures = [executor.submit(write, index, block) for index in active]
+					sha.update(block)
+					for future in futures:
+						future.result()
+				else:
+					sha.update(block)
+					for index in active:
+						write(index, block)
+		return sha.hexdigest(), errors
+
+	@staticmethod
+	def zip_write(zipfile, path, name):
+		'''Write file to zip archive and calculate SHA256 reading it only once'''
+		info = ZipInfo.from_file(path, name)
+		info.compress_type = zipfile.compression
+		sha = sha256()
+		with path.open('rb', buffering=0) as sfh, zipfile.open(info, 'w', force_zip64=True) as dfh:
+			for block in PathUtils.read_blocks(sfh, PathUtils.block_size(info.file_size)):
 				sha.update(block)
-		src_sha = sha.hexdigest()
-		if PathUtils.hash_file(dst) == src_sha:
-			return src_sha
+				dfh.write(block)
+		return sha.hexdigest()
+
+	@staticmethod
+	def zip_link(zipfile, name, target):
+		'''Write member as symbolic link to other member, the way unzip on unix restores links,
+			Windows Explorer and most Windows tools extract only the link target as file content
+		'''
+		info = ZipInfo(name, date_time=localtime()[:6])
+		info.create_system = 3	# unix
+		info.external_attr = PathUtils.ZIP_LINK_ATTR
+		zipfile.writestr(info, relpath(target, dirname(name) or '.'))
 
 	@staticmethod
-	def zip_dir(root, archive):
-		'''Build zip file'''
+	def zip_dir(root, archive, links=False):
+		'''Build zip file, with links files with same content are stored once and the others as symbolic links
+			(needs an extractor that restores unix links), return hash, errors and bytes saved by links
+		'''
 		file_errors = list()
 		dir_errors = list()
+		saved = 0
+		known = dict()	# (size, hash): 1st member with this content
+		known_sizes = set()	# only files with a size already seen can be duplicates
 		with ZipFile(archive, 'w', ZIP_DEFLATED) as zf:
 			for path, relative, tp in PathUtils.walk(root):
 				if tp == 'file':
 					try:
-						zf.write(path, relative)
+						if links:
+							size = path.stat().st_size
+							key = (size, PathUtils.hash_file(path)) if size and size in known_sizes else None
+							if key in known:
+								PathUtils.zip_link(zf, relative.as_posix(), known[key])
+								saved += size
+							else:	# hash while zipping to read file once
+								known[(size, PathUtils.zip_write(zf, path, relative.as_posix()))] = relative.as_posix()
+								known_sizes.add(size)
+						else:
+							zf.write(path, relative)
 					except:
 						file_errors.append(relative)
 				elif tp == 'dir':
@@ -101,5 +280,5 @@ class PathUtils:
 						zf.mkdir(f'{relative}')
 					except:
 						dir_errors.append(relative)
-		return PathUtils.hash_file(archive), file_errors, dir_errors
+		return PathUtils.hash_file(archive), file_errors, dir_errors, saved
 
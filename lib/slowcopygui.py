@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from threading import Thread
+from tkinter import Tk, PhotoImage
+from tkinter.font import nametofont
+from tkinter.ttk import Frame, Label, Button
+from tkinter.scrolledtext import ScrolledText
+from tkinter.messagebox import askyesno, showerror
+from tkinter.filedialog import askdirectory
+from idlelib.tooltip import Hovertip
+
+class Worker(Thread):
+	'''Thread that does the work while Tk is running the GUI'''
+
+	def __init__(self, gui, copy):
+		'''Get all attributes from GUI and run Copy'''
+		super().__init__()
+		self.gui = gui
+		self.copy = copy
+
+	def run(self):
+		'''Run thread'''
+		copy = self.copy(self.gui.source_paths, echo=self.gui.echo)
+		self.gui.finished(copy.exceptions)
+
+class Gui(Tk):
+	'''GUI look and feel'''
+
+	PAD = 4
+	X_FACTOR = 40
+	Y_FACTOR = 30
+	GREEN_FG = 'black'
+	GREEN_BG = 'pale green'
+	RED_FG = 'black'
+	RED_BG = 'coral'
+
+	def __init__(self, copy, title, label, icon_base64):
+		'''Open application window, copy is the class that does the work'''
+		super().__init__()
+		self.copy = copy
+		self.worker = None
+		self.title(title)
+		self.rowconfigure(1, weight=1)
+		self.columnconfigure(1, weight=1)
+		self.rowconfigure(3, weight=1)
+		self.wm_iconphoto(True, PhotoImage(data=icon_base64))
+		self.protocol('WM_DELETE_WINDOW', self._quit_app)
+		font = nametofont('TkTextFont').actual()
+		self.font_family = font['family']
+		self.font_size = font['size']
+		self.min_size_x = self.font_size * self.X_FACTOR
+		self.min_size_y = self.font_size * self.Y_FACTOR
+		self.minsize(self.min_size_x , self.min_size_y)
+		self.geometry(f'{self.min_size_x}x{self.min_size_y}')
+		self.resizable(True, True)
+		self.padding = int(self.font_size / self.PAD)
+		frame = Frame(self)
+		frame.grid(row=0, column=0, columnspan=2, sticky='news',
+			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
+		Label(frame, text=label).pack(padx=self.padding, pady=self.padding)
+		frame = Frame(self)
+		frame.grid(row=1, column=0,	sticky='n')
+		self.source_button = Button(frame, text='Source', command=self._add_dir)
+		self.source_button.pack(padx=self.padding, pady=self.padding, fill='x', expand=True)
+		Hovertip(self.source_button, 'Add directory you want to copy')
+		self.source_text = ScrolledText(self, font=(self.font_family, self.font_size),
+			padx = self.padding, pady = self.padding)
+		self.source_text.grid(row=1, column=1, sticky='news',
+			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
+		frame = Frame(self)
+		frame.grid(row=2, column=1, sticky='news', padx=self.padding, pady=self.padding)
+		Label(frame, text='Copy to import directory').pack(padx=self.padding, pady=self.padding, side='left')
+		self.exec_button = Button(frame, text='Execute', command=self._execute)
+		self.exec_button.pack(padx=self.padding, pady=self.padding, side='right')
+		Hovertip(self.exec_button, 'Start copy process')
+		frame = Frame(self)
+		frame.grid(row=3, column=0,	sticky='n')
+		self.clear_button = Button(frame, text='Clear', command=self._clear_info)
+		self.clear_button.pack(padx=self.padding, pady=self.padding, fill='x', expand=True)
+		Hovertip(self.clear_button, 'Clear info field')
+		self.info_text = ScrolledText(self, font=(self.font_family, self.font_size),
+			padx = self.padding, pady = self.padding)
+		self.info_text.grid(row=3, column=1, columnspan=1, sticky='news',
+			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
+		self.info_text.bind('<Key>', lambda dummy: 'break')
+		self.info_text.configure(state='disabled')
+		self.info_fg = self.info_text.cget('foreground')
+		self.info_bg = self.info_text.cget('background')
+		frame = Frame(self)
+		frame.grid(row=4, column=1, sticky='news', padx=self.padding, pady=self.padding)
+		self.info_label = Label(frame)
+		self.info_label.pack(padx=self.padding, pady=self.padding, side='left')
+		self.label_fg = self.info_label.cget('foreground')
+		self.label_bg = self.info_label.cget('background')
+		self.quit_button = Button(frame, text='Quit', command=self._quit_app)
+		self.quit_button.pack(padx=self.padding, pady=self.padding, side='right')
+		self._init_warning()
+
+	def _add_dir(self):
+		'''Add directory into field'''
+		directory = askdirectory(title='Select directory to copy', mustexist=True)
+		if directory:
+			self.source_text.insert('end', f'{directory}\n')
+
+	def echo(self, *arg):
+		'''Write message to info field (ScrolledText)'''
+		msg = ' '.join(arg)
+		self.info_text.configure(state='normal')
+		self.info_text.insert('end', f'{msg}\n')
+		self.info_text.configure(state='disabled')
+		self.info_text.yview('end')
+
+	def _clear_info(self):
+		'''Clear info text'''
+		self.info_text.configure(state='normal')
+		self.info_text.delete('1.0', 'end')
+		self.info_text.configure(state='disabled')
+		self.info_text.configure(foreground=self.info_fg, background=self.info_bg)
+		self._warning_state = 'stop'
+
+	def _execute(self):
+		'''Start copy process / worker'''
+		source_paths = self.source_text.get('1.0', 'end').strip()
+		if not source_paths:
+			return
+		self.source_button.configure(state='disabled')
+		self.source_text.configure(state='disabled')
+		self.exec_button.configure(state='disabled')
+		self._clear_info()
+		self.quit_button.configure(state='disabled')
+		self.source_paths = source_paths.split('\n')
+		self.worker = Worker(self, self.copy)
+		self.worker.start()
+
+	def _init_warning(self):
+		'''Init warning functionality'''
+		self._warning_state = 'disabled'
+		self._warning()
+
+	def _warning(self):
+		'''Show flashing warning'''
+		if self._warning_state == 'enable':
+			self.info_label.configure(text='WARNING')
+			self._warning_state = '1'
+		if self._warning_state == '1':
+			self.info_label.configure(foreground=self.RED_FG, background=self.RED_BG)
+			self._warning_state = '2'
+		elif self._warning_state == '2':
+			self.info_label.configure(foreground=self.label_fg, background=self.label_bg)
+			self._warning_state = '1'
+		elif self._warning_state != 'disabled':
+			self.info_label.configure(text= '', foreground=self.label_fg, background=self.label_bg)
+			self._warning_state = 'disabled'
+		self.after(500, self._warning)
+
+	def finished(self, exceptions):
+		'''Run this when Worker has finished'''
+		self.source_text.configure(state='normal')
+		self.source_text.delete('1.0', 'end')
+		self.source_button.configure(state='normal')
+		self.exec_button.configure(state='normal')
+		self.quit_button.configure(state='normal')
+		self.worker = None
+		if exceptions:
+			self.info_text.configure(foreground=self.RED_FG, background=self.RED_BG)
+			self._warning_state = 'enable'
+			showerror(title='Warning', message='Problems occured!')
+		else:
+			self.info_text.configure(foreground=self.GREEN_FG, background=self.GREEN_BG)
+
+	def _quit_app(self):
+		'''Quit app, ask when copy processs is running'''
+		if self.worker and not askyesno(
+			title='Copy process is running!',
+			message='Are you sure to kill copy process / application?'
+		):
+			return
+		self.destroy()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import builtins
+from errno import EIO, ENOENT, ENOTSUP
+from random import Random
+from threading import Lock
+from time import sleep, monotonic
+
+class SlowFile:
+	'''Wrap file object, delay reads and writes and inject faults'''
+
+	def __init__(self, fh, shim):
+		'''Wrap opened file'''
+		self._fh = fh
+		self._shim = shim
+
+	def __getattr__(self, name):
+		'''Everything not overwritten goes to the real file'''
+		return getattr(self._fh, name)
+
+	def __enter__(self):
+		'''Use as context manager'''
+		return self
+
+	def __exit__(self, *args):
+		'''Close real file'''
+		self._fh.close()
+
+	def __iter__(self):
+		'''Iterate lines'''
+		return iter(self.readline, self._fh.read(0))
+
+	def fileno(self):
+		'''No file descriptor, so mmap, sendfile etc. have to fall back as on network shares'''
+		raise OSError(ENOTSUP, 'No file descriptor on simulated storage')
+
+	def _size(self, size):
+		'''Give size to read, maybe shortened'''
+		if size and size > 1 and self._shim.fault(self._shim.short_reads):
+			return self._shim.random.randint(1, size - 1)
+		return size
+
+	def read(self, size=-1):
+		'''Read slowly'''
+		self._shim.delay()
+		self._shim.maybe_fail()
+		data = self._fh.read(self._size(size) if size and size > 0 else size)
+		self._shim.transfer(len(data))
+		return data
+
+	def readline(self, size=-1):
+		'''Read line slowly'''
+		self._shim.delay()
+		self._shim.maybe_fail()
+		data = self._fh.readline(size)
+		self._shim.transfer(len(data))
+		return data
+
+	def readinto(self, buffer):
+		'''Read into buffer slowly'''
+		self._shim.delay()
+		self._shim.maybe_fail()
+		length = self._fh.readinto(memoryview(buffer)[:self._size(len(buffer))])
+		self._shim.transfer(length or 0)
+		return length
+
+	def write(self, data):
+		'''Write slowly'''
+		self._shim.delay()
+		self._shim.maybe_fail()
+		self._shim.transfer(len(data))
+		return self._fh.write(data)
+
+class StorageShim:
+	'''Simulate slow and faulty storage (e.g. network share) for performance and error tests,
+		patches open, stat and scandir for paths under root while used as context manager:
+		with StorageShim(root, latency=0.005, bandwidth=10*2**20):
+			PathUtils.copy_file(src, dst)
+	'''
+
+	def __init__(self, root=None, latency=0, bandwidth=None, short_reads=0, errors=0, vanish=0, seed=None):
+		'''Define storage behaviour,
+			root: only paths under root are affected, None for all paths
+			latency: seconds every operation (open, read, write, stat, scandir) takes
+			bandwidth: bytes per second for all reads and writes together, None for no limit
+			short_reads: probability that read returns less bytes than requested
+			errors: probability that an operation raises EIO
+			vanish: probability that open or stat finds no file
+		'''
+		self.root = os.fspath(root) if root else None
+		self.latency = latency
+		self.bandwidth = bandwidth
+		self.short_reads = short_reads
+		self.errors = errors
+		self.vanish = vanish
+		self.random = Random(seed)
+		self.operations = 0	# count operations that went to simulated storage
+		self._lock = Lock()
+		self._busy_until = 0
+		self._patched = list()
+
+	def fault(self, probability):
+		'''Return True by given probability'''
+		if not probability:
+			return False
+		with self._lock:
+			return self.random.random() < probability
+
+	def delay(self):
+		'''Wait for latency of one operation'''
+		with self._lock:
+			self.operations += 1
+		if self.latency:
+			sleep(self.latency)
+
+	def transfer(self, size):
+		'''Wait until size bytes went through the shared bandwidth'''
+		if not self.bandwidth or not size:
+			return
+		with self._lock:
+			start = max(monotonic(), self._busy_until)
+			self._busy_until = start + size / self.bandwidth
+			wait = self._busy_until - monotonic()
+		if wait > 0:
+			sleep(wait)
+
+	def maybe_fail(self, path=None):
+		'''Raise I/O error or file not found by given probabilities'''
+		if path and self.fault(self.vanish):
+			raise FileNotFoundError(ENOENT, 'Vanished on simulated storage', path)
+		if self.fault(self.errors):
+			raise OSError(EIO, 'Input/output error on simulated storage', path)
+
+	def affects(self, path):
+		'''True if path is on simulated storage'''
+		if isinstance(path, int):	# file descriptor
+			return False
+		path = os.fspath(path)
+		if isinstance(path, bytes):
+			path = os.fsdecode(path)
+		return not self.root or path == self.root or path.startswith(self.root.rstrip(os.sep) + os.sep)
+
+	def _open(self, original):
+		'''Build replacement for open'''
+		def slow_open(file, *args, **kwargs):
+			if not self.affects(file):
+				return original(file, *args, **kwargs)
+			self.delay()
+			self.maybe_fail(os.fspath(file))
+			return SlowFile(original(file, *args, **kwargs), self)
+		return slow_open
+
+	def _stat(self, original):
+		'''Build replacement for stat'''
+		def slow_stat(path, *args, **kwargs):
+			if self.affects(path):
+				self.delay()
+				self.maybe_fail(os.fspath(path))
+			return original(path, *args, **kwargs)
+		return slow_stat
+
+	def _scandir(self, original):
+		'''Build replacement for scandir'''
+		def slow_scandir(path='.'):
+			if self.affects(path):
+				self.delay()
+				self.maybe_fail()
+			return original(path)
+		return slow_scandir
+
+	def __enter__(self):
+		'''Patch open (= io.open), os.stat and os.scandir everywhere they are referenced'''
+		replacements = {
+			builtins.open: self._open(builtins.open),
+			os.stat: self._stat(os.stat),
+			os.scandir: self._scandir(os.scandir)
+		}
+		for module in list(sys.modules.values()):
+			for name, value in list(getattr(module, '__dict__', dict()).items()):
+				try:
+					replacement = replacements.get(value)
+				except Exception:	# not hashable
+					continue
+				if replacement:
+					setattr(module, name, replacement)
+					self._patched.append((module, name, value))
+		return self
+
+	def __exit__(self, *args):
+		'''Restore original functions'''
+		for module, name, value in reversed(self._patched):
+			setattr(module, name, value)
+		self._patched = list()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import RawIOBase
+from array import array
+from stat import S_ISLNK
+from posixpath import normpath, join, dirname
+from struct import unpack
+from hashlib import sha256
+from marshal import dumps, loads
+from zlib import decompressobj
+from zipfile import ZipFile, BadZipFile, ZIP_STORED, ZIP_DEFLATED
+
+class ZipMember(RawIOBase):
+	'''Read stored or deflated member of zip archive without ZipFile'''
+
+	def __init__(self, fh, header_offset, compress_size, compress_type):
+		'''Skip local file header and prepare to read compressed data'''
+		self._fh = fh
+		self._fh.seek(header_offset)
+		header = self._fh.read(30)
+		if len(header) != 30 or header[:4] != b'PK\x03\x04':
+			raise BadZipFile(f'Bad local file header at offset {header_offset}')
+		self._fh.seek(sum(unpack('<HH', header[26:30])), 1)	# skip file name and extra field
+		self._remaining = compress_size
+		self._decompressor = decompressobj(-15) if compress_type == ZIP_DEFLATED else None
+		self._pending = b''
+
+	def readable(self):
+		'''This is a reader'''
+		return True
+
+	def _read_compressed(self, size):
+		'''Read next chunk of compressed data'''
+		data = self._fh.read(min(size, self._remaining))
+		if not data:
+			raise BadZipFile('Truncated member')
+		self._remaining -= len(data)
+		return data
+
+	def readinto(self, buffer):
+		'''Fill buffer with uncompressed data, return number of bytes'''
+		if not self._decompressor:	# stored = not compressed
+			if not self._remaining:
+				return 0
+			data = self._read_compressed(len(buffer))
+			buffer[:len(data)] = data
+			return len(data)
+		while not self._pending:
+			if self._decompressor.unconsumed_tail:
+				data = self._decompressor.unconsumed_tail
+			elif self._remaining:
+				data = self._read_compressed(len(buffer))
+			else:
+				self._pending = self._decompressor.flush()
+				if not self._pending:
+					return 0
+				break
+			self._pending = self._decompressor.decompress(data, len(buffer))
+		length = min(len(buffer), len(self._pending))
+		buffer[:length] = self._pending[:length]
+		self._pending = self._pending[length:]
+		return length
+
+class ZipIndex:
+	'''Central directory of zip archive, cached as file to skip parsing when archive did not change'''
+
+	VERSION = 2	# increase when cache format changes
+	TAIL_SIZE = 2**16 + 22	# end of central directory record has to be in this part at the end of the file
+
+	def __init__(self, path, cache_dir=None):
+		'''Load index from cache or read central directory'''
+		self.path = path
+		stat = path.stat()
+		self.key = (stat.st_size, stat.st_mtime_ns, self._end_offset(stat.st_size))
+		self.cache_path = cache_dir / f'{sha256(f"{path.absolute()}".encode()).hexdigest()}.idx' if cache_dir else None
+		self.cached = self._load()
+		if not self.cached:
+			self._read()
+			if self.cache_path:
+				try:
+					self._save()
+				except OSError:	# archive can be checked without cache
+					pass
+		self.positions = {name: position for position, name in enumerate(self.names)}
+		self._fh = None
+
+	def _end_offset(self, size):
+		'''Return offset of the end of central directory record'''
+		with self.path.open('rb') as fh:
+			tail_offset = max(size - self.TAIL_SIZE, 0)
+			fh.seek(tail_offset)
+			position = fh.read().rfind(b'PK\x05\x06')
+		if position < 0:
+			raise BadZipFile(f'{self.path} is not a zip file')
+		return tail_offset + position
+
+	def _load(self):
+		'''Load index from cache file, return False if there is none or archive changed'''
+		if not self.cache_path:
+			return False
+		try:
+			version, key, names, *arrays = loads(self.cache_path.read_bytes())
+		except (OSError, EOFError, ValueError, TypeError):
+			return False
+		if version != self.VERSION or tuple(key) != self.key:
+			return False
+		self.names = names.split('\0') if names else list()
+		self.sizes, self.compress_sizes, self.crcs, self.offsets = (array('Q', data) for data in arrays[:4])
+		self.compress_types, self.links = arrays[4:6]
+		return True
+
+	def _read(self):
+		'''Parse central directory of the archive'''
+		self.names = list()
+		self.sizes = array('Q')
+		self.compress_sizes = array('Q')
+		self.crcs = array('Q')
+		self.offsets = array('Q')
+		compress_types = bytearray()
+		self.links = dict()	# members that are symbolic links to other members (deduplicated files)
+		with ZipFile(self.path) as zf:
+			for info in zf.infolist():
+				if info.create_system == 3 and S_ISLNK(info.external_attr >> 16):
+					target = zf.read(info).decode('utf-8')
+					self.links[info.filename] = normpath(join(dirname(info.filename), target))
+				self.names.append(info.filename)
+				self.sizes.append(info.file_size)
+				self.compress_sizes.append(info.compress_size)
+				self.crcs.append(info.CRC)
+				self.offsets.append(info.header_offset)
+				if info.flag_bits & 1 or not info.compress_type in (ZIP_STORED, ZIP_DEFLATED):
+					compress_types.append(255)	# encrypted or unsupported, has to be read by ZipFile
+				else:
+					compress_types.append(info.compress_type)
+		self.compress_types = bytes(compress_types)
+
+	def _save(self):
+		'''Write index to cache file'''
+		self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = self.cache_path.with_suffix('.tmp')
+		tmp_path.write_bytes(dumps((self.VERSION, self.key, '\0'.join(self.names),
+			self.sizes.tobytes(), self.compress_sizes.tobytes(), self.crcs.tobytes(), self.offsets.tobytes(),
+			self.compress_types, self.links
+		)))
+		tmp_path.replace(self.cache_path)
+
+	def resolve(self, name):
+		'''Return name of member a link points to or given name'''
+		return self.links.get(name, name)
+
+	def size(self, name):
+		'''Return uncompressed file size of member, None if not in archive'''
+		position = self.positions.get(self.resolve(name))
+		if position is not None:
+			return self.sizes[position]
+
+	def can_open(self, name):
+		'''True if member can be read without ZipFile'''
+		return self.compress_types[self.positions[self.resolve(name)]] in (ZIP_STORED, ZIP_DEFLATED)
+
+	def open(self, name):
+		'''Open member to read'''
+		if not self._fh:
+			self._fh = self.path.open('rb')
+		position = self.positions[self.resolve(name)]
+		return ZipMember(self._fh, self.offsets[position], self.compress_sizes[position], self.compress_types[position])
+
+	def close(self):
+		'''Close archive file'''
+		if self._fh:
+			self._fh.close()
+			self._fh = None
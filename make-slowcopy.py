@@ -8,20 +8,31 @@ __email__ = 'markus.thilo@gmail.com'
 __status__ = 'Testing'
 __description__ = 'Use PyInstaller to build SlowCopy executables'
 
+from sys import argv as sys_argv
 from pathlib import Path
 from shutil import rmtree
 import PyInstaller.__main__
 
+TARGETS = {	# give target as argument, default is onefile
+	'onefile': ('', ['--onefile', '--noconsole']),	# one exe with gui, unpacks itself on every launch
+	'onedir': ('', ['--onedir', '--noconsole']),	# directory with exe and libs, nothing to unpack on launch
+	'lean': ('-cli', ['--onedir', '--console', '--exclude-module', 'tkinter', '--exclude-module', 'idlelib'])	# cmd line only
+}
+
 if __name__ == '__main__':	# start here
+	target = sys_argv[1] if len(sys_argv) > 1 else 'onefile'
+	if not target in TARGETS:
+		raise SystemExit(f'Unknown target {target}, use one of: {", ".join(TARGETS)}')
+	name_suffix, options = TARGETS[target]
 	cwd_path = Path.cwd()
 	icon_path = cwd_path / 'appicon.ico'
 	build_path = cwd_path / 'build'
 	build_path.mkdir(exist_ok=True)
-	for user, dst, log in [
-		('LKA 71', 'C:/Users/THI/Documents/test_dst', 'C:/Users/THI/Documents/test_log'),
-		('THI', 'C:/Users/THI/Documents/test_dst', 'C:/Users/THI/Documents/test_log')
+	for user, dst, log, backup in [	# backup is optional, empty string for none
+		('LKA 71', 'C:/Users/THI/Documents/test_dst', 'C:/Users/THI/Documents/test_log', ''),
+		('THI', 'C:/Users/THI/Documents/test_dst', 'C:/Users/THI/Documents/test_log', '')
 	]:
-		slowcopy_name = f'slowcopy-{user.lower().replace(' ', '_')}.py'
+		slowcopy_name = f'slowcopy-{user.lower().replace(' ', '_')}{name_suffix}.py'
 		slowcopy_path = build_path / slowcopy_name
 		with slowcopy_path.open(mode='w', encoding='utf-8') as f:
 			for line in cwd_path.joinpath('slowcopy.py').read_text(encoding='utf-8').split('\n'):
@@ -31,8 +42,10 @@ if __name__ == '__main__':	# start here
 					print(f"__destination__ = '{dst}'", file=f)
 				elif line.startswith('__logging__ ='):
 					print(f"__logging__ = '{log}'", file=f)
+				elif line.startswith('__backup__ ='):
+					print(f"__backup__ = '{backup}'", file=f)
 				else:
 					print(line, file=f)
-		PyInstaller.__main__.run([f'{slowcopy_path}', '--onefile', '--icon', f'{icon_path}', '--noconsole'])
+		PyInstaller.__main__.run([f'{slowcopy_path}', '--icon', f'{icon_path}'] + options)
 		cwd_path.joinpath(slowcopy_name).with_suffix('.spec').unlink()
 	rmtree(build_path)
@@ -11,26 +11,179 @@ __destination__ = 'C:\\Users\\THI\\Documents\\test_dst\\dep1'
 #__destination__ = '/home/neo/Documents/test_dst'
 __logging__ = 'C:\\Users\\THI\\Documents\\test_trigger\\dep1'
 #__logging__ = '/home/neo/Documents/test_log\dep1'
+__backup__ = ''	# optional, e.g. 'C:\\Users\\THI\\Documents\\test_backup\\dep1' - source is read once for both destinations
 
 ### standard libs ###
 from sys import executable as __executable__
 from sys import argv as sys_argv
 from sys import exit as sys_exit
+from os import link
 from pathlib import Path
-from threading import Thread
-### tk libs ###
-from tkinter import Tk, PhotoImage
-from tkinter.font import nametofont
-from tkinter.ttk import Frame, Label, Button
-from tkinter.scrolledtext import ScrolledText
-from tkinter.messagebox import askyesno, showerror
-from tkinter.filedialog import askdirectory
-from idlelib.tooltip import Hovertip
+from contextlib import nullcontext
+from zipfile import ZipFile, ZIP_DEFLATED
 ### custom libs ###
 from lib.pathutils import PathUtils
 from lib.logger import Logger
 from lib.stringutils import StringUtils
 
+class Destination:
+	'''Directory or zip archive to copy one source directory to'''
+
+	def __init__(self, path, zipped=False, block_size=None, use_mmap=False):
+		'''Create directory or zip archive'''
+		self.name = path.name	# zip members are stored under this directory as the surveillance expects
+		self.zipped = zipped
+		self.block_size = block_size	# None to auto-tune by file size
+		self.use_mmap = use_mmap	# hash written files via mmap to verify them
+		self.tsv = 'Path\tSize\tHash'	# only files that made it to this destination
+		self.files = 0
+		self.size = 0
+		self.saved = 0	# bytes that did not have to be written due to dedup
+		self.written = set()	# relative paths of files that made it to this destination
+		if zipped:
+			self.path = path.parent / f'{path.name}.zip'
+			self._zipfile = ZipFile(self.path, 'w', ZIP_DEFLATED)
+		else:
+			self.path = path
+			self.path.mkdir(exist_ok=True)
+
+	def _member(self, rel_path):
+		'''Return name of zip member'''
+		return f'{self.name}/{rel_path.as_posix()}'
+
+	def mkdir(self, rel_path):
+		'''Generate subdirectory'''
+		if not self.zipped:
+			self.path.joinpath(rel_path).mkdir(parents=True, exist_ok=True)
+		elif rel_path != Path('.'):
+			self._zipfile.mkdir(self._member(rel_path))
+
+	def open(self, rel_path):
+		'''Open file to write'''
+		if self.zipped:
+			return self._zipfile.open(self._member(rel_path), 'w', force_zip64=True)
+		return self.path.joinpath(rel_path).open('wb')
+
+	def verify(self, rel_path, hash):
+		'''Check written file, zip archive has the crc of the written data anyway'''
+		return self.zipped or PathUtils.hash_file(self.path / rel_path,
+			block_size = self.block_size,
+			use_mmap = self.use_mmap
+		) == hash
+
+	def add_file(self, path, rel_path, hash):
+		'''Copy file that has already been written (e.g. zipped subdir), return True on success'''
+		if self.zipped:
+			self._zipfile.write(path, self._member(rel_path))
+			return True
+		return PathUtils.copy_file(path, self.path / rel_path, block_size=self.block_size, use_mmap=self.use_mmap)[0] == hash
+
+	def link(self, original, rel_path):
+		'''Reference file with same content that has already been written, return method'''
+		if not original in self.written:
+			raise FileNotFoundError(f'{original} has not been written to {self.path}')
+		if self.zipped:
+			PathUtils.zip_link(self._zipfile, self._member(rel_path), self._member(original))
+			return 'zip link'
+		path = self.path / rel_path
+		path.unlink(missing_ok=True)
+		try:
+			link(self.path / original, path)
+		except OSError:	# e.g. file system does not support hard links
+			if not PathUtils.copy_file(self.path / original, path, block_size=self.block_size, use_mmap=self.use_mmap)[0]:
+				raise OSError(f'{original} and {path} are not identical')
+			return 'copy'
+		return 'hard link'
+
+	def add(self, rel_path, size, hash):
+		'''Register successfully written file'''
+		self.tsv += f'\n{rel_path}\t{size}\t{hash}'
+		self.files += 1
+		self.size += size
+		self.written.add(rel_path)
+
+	def close(self, tsv_name=None):
+		'''Write tsv file (if name is given) and close zip archive, closing again does nothing'''
+		if self.zipped:
+			if not self._zipfile.fp:	# already closed
+				return
+			try:
+				if tsv_name:
+					self._zipfile.writestr(self._member(Path(tsv_name)), self.tsv)
+			finally:
+				self._zipfile.close()
+		elif tsv_name:
+			self.path.joinpath(tsv_name).write_text(self.tsv, encoding='utf-8')
+
+	@staticmethod
+	def link_file(src_path, original, rel_path, size, hash, destinations, executor=None, zip_links=False):
+		'''Reference duplicate instead of copying, zip archives get a full copy unless zip_links is True,
+			so do destinations the original could not be written to, return method and problems per destination
+		'''
+		methods = set()
+		problems = dict()
+		to_copy = [	# original is missing where writing it failed
+			destination for destination in destinations
+			if destination.zipped and not zip_links or not original in destination.written
+		]
+		for destination in destinations:
+			if destination in to_copy:
+				continue
+			try:
+				method = destination.link(original, rel_path)
+			except Exception as ex:
+				problems[destination] = f'{ex}'
+			else:
+				methods.add(method)
+				if method != 'copy':
+					destination.saved += size
+		if to_copy:
+			copy_hash, backend, copy_problems = Destination.copy_file(src_path, rel_path, to_copy, executor=executor)
+			methods.add(backend)
+			problems.update(copy_problems)
+			if copy_hash != hash:
+				for destination in to_copy:
+					problems[destination] = 'Source file changed while copying'
+		return f'dedup ({StringUtils.join(sorted(methods), delimiter=", ")}) of {original}', problems
+
+	@staticmethod
+	def copy_file(src_path, rel_path, destinations, executor=None):
+		'''Copy file to all destinations reading source once, return hash, backend and problems per destination'''
+		block_size = destinations[0].block_size	# all destinations of a copy job have the same settings
+		if len(destinations) == 1 and not destinations[0].zipped:	# kernel copy might be possible
+			hash, backend = PathUtils.copy_file(src_path, destinations[0].path / rel_path,
+				block_size = block_size,
+				use_mmap = destinations[0].use_mmap
+			)
+			if hash:
+				return hash, backend, dict()
+			return hash, backend, {destinations[0]: 'Source file and copy are not identical'}
+		problems = dict()
+		opened = list()
+		writers = list()
+		for destination in destinations:
+			try:
+				writers.append(destination.open(rel_path))
+			except Exception as ex:
+				problems[destination] = f'{ex}'
+			else:
+				opened.append(destination)
+		errors = [None] * len(writers)
+		try:
+			hash, errors = PathUtils.fan_out(src_path, writers, executor=executor, block_size=block_size)
+		finally:
+			for index, writer in enumerate(writers):
+				try:
+					writer.close()
+				except Exception as ex:
+					errors[index] = errors[index] if errors[index] else ex
+		for destination, error in zip(opened, errors):
+			if error:
+				problems[destination] = f'{error}'
+			elif not destination.verify(rel_path, hash):
+				problems[destination] = 'Source file and copy are not identical'
+		return hash, 'fan-out', problems
+
 class Copy:
 	'''Copy functionality'''
 
@@ -43,10 +196,28 @@ class Copy:
 	### paths ###
 	DST_PATH = Path(__destination__)	# root directory to copy
 	LOG_PATH = Path(__logging__)	# directory to write logs that trigger surveillance
+	BACKUP_PATH = Path(__backup__) if __backup__ else None	# additional destination, None for none
+	BACKUP_ZIPPED = True	# write every source directory as one zip archive to the backup destination
+	DEDUP = False	# store files with same content only once as hard links in not zipped destinations
+	ZIP_LINKS = False	# with DEDUP store duplicates in zip archives as unix symbolic links,
+						# they need an extractor that restores links (not Windows Explorer), else they are stored in full
+	BLOCK_SIZE = None	# bytes per read/write, None to auto-tune by file size (64 KiB - 16 MiB), e.g. set for network shares
+	MMAP = False	# verify big copies hashing them via mmap, only if all destinations are local disks -
+					# on network shares a failing connection kills the process
 
-	def __init__(self, root_dirs, echo=print):
+	def __init__(self, root_dirs, echo=print, dst_path=None, log_path=None, backup_path=None, io_limit=None, dedup=None):
 		'''Generate object to copy and to zip'''
 		self.exceptions = True
+		dedup = self.DEDUP if dedup is None else dedup
+		dst_root = dst_path if dst_path else self.DST_PATH
+		log_root = log_path if log_path else self.LOG_PATH
+		backup_root = backup_path if backup_path else self.BACKUP_PATH
+		dst_roots = [(dst_root, False)]
+		if backup_root:
+			dst_roots.append((backup_root, self.BACKUP_ZIPPED))
+		io_limit = io_limit if io_limit else nullcontext()	# limit parallel copy/zip when running as daemon
+		root_dirs = list(root_dirs)
+		succeeded = 0	# exceptions stay True unless every root dir is copied without problems
 		for root_dir in root_dirs:	# loop through all given root dirs
 			root_path = Path(root_dir.strip('"').strip("'").strip())	# make sure f**king win gets pure path
 			echo(f'Preparing to copy {root_path}')
@@ -71,254 +242,263 @@ class Copy:
 				path: infos for path, infos in files.items()
 				if paths_to_zip - set(path.parents) == paths_to_zip
 			}
-			dst_path = self.DST_PATH / root_path.name
-			try:
-				dst_path.mkdir(exist_ok=True)
-			except Exception as ex:
-				echo(f'Unable to generate directory {path}:\n{ex}')
-				return
-			log_path = self.LOG_PATH / root_path.name
-			try:
-				log_path.mkdir(exist_ok=True)
-			except Exception as ex:
-				echo(f'Unable to generate directory {path}:\n{ex}')
-				return
-			log_file_path = log_path / self.LOG_NAME
-			log = Logger(log_file_path, info=f'Copying {root_path} to {dst_path}', echo=echo)
-			tsv = 'Path\tSize\tHash'	# will later be written as tsv files
-			echo(f'Generating {len(dirs2copy)} directories')
-			for src_dir, infos in dirs2copy.items():
-				path = dst_path / src_dir
+			destinations = list()
+			log = None
+			executor = None
+			try:	# make sure zip archives and handles get closed on every return or exception
 				try:
-					path.mkdir(parents=True, exist_ok=True)
+					for root, zipped in dst_roots:
+						destinations.append(Destination(root / root_path.name, zipped=zipped,
+							block_size = self.BLOCK_SIZE,
+							use_mmap = self.MMAP
+						))
 				except Exception as ex:
-					log.warning(f'Unable to generate directory {path}:\n{ex}')
-			all_files = len(files2copy) + len(dirs2zip)	# how much files to copy?
-			counter = 1
-			total_size = 0
-			for src_file, infos in files2copy.items():	# loop to copy files
-				echo(f'Copying {src_file}) ({counter} of {all_files}, {StringUtils.bytes(infos['size'])})')
-				path = dst_path / src_file
+					echo(f'Unable to generate destination for {root_path}:\n{ex}')
+					return
+				log_path = log_root / root_path.name
 				try:
-					hash = PathUtils.copy_file(root_path / src_file, path)
+					log_path.mkdir(exist_ok=True)
 				except Exception as ex:
-					log.error(f'Unable to copy source file to {path}:\n{ex}')
-				else:
-					counter += 1
-					total_size += infos['size']
-					if hash:
-						tsv += f'\n{src_file}\t{infos["size"]}\t{hash}'
+					echo(f'Unable to generate directory {log_path}:\n{ex}')
+					return
+				log_file_path = log_path / self.LOG_NAME
+				log = Logger(log_file_path,
+					info=f'Copying {root_path} to {StringUtils.join((destination.path for destination in destinations), delimiter=", ")}',
+					echo = echo
+				)
+				if len(destinations) > 1:	# write to destinations concurrently
+					from concurrent.futures import ThreadPoolExecutor
+					executor = ThreadPoolExecutor(max_workers=len(destinations))
+				tsv = 'Path\tSize\tHash'	# will later be written as tsv files
+				echo(f'Generating {len(dirs2copy)} directories')
+				for src_dir, infos in dirs2copy.items():
+					for destination in destinations:
+						try:
+							destination.mkdir(src_dir)
+						except Exception as ex:
+							log.warning(f'Unable to generate directory {src_dir} in {destination.path}:\n{ex}')
+				all_files = len(files2copy) + len(dirs2zip)	# how much files to copy?
+				counter = 1
+				total_size = 0
+				known = dict()	# (size, hash): 1st file with this content
+				known_sizes = set()	# only files with a size already seen can be duplicates
+				for src_file, infos in files2copy.items():	# loop to copy files
+					echo(f'Copying {src_file}) ({counter} of {all_files}, {StringUtils.bytes(infos['size'])})')
+					try:
+						with io_limit:
+							key = None
+							if dedup and infos['size'] in known_sizes:	# hash 1st to know if it is a duplicate
+								key = (infos['size'], PathUtils.hash_file(root_path / src_file))
+							if key in known:
+								hash = key[1]
+								backend, problems = Destination.link_file(root_path / src_file, known[key], src_file,
+									infos['size'], hash, destinations, executor=executor, zip_links=self.ZIP_LINKS
+								)
+							else:	# 1st file of a size gets hashed while copying
+								hash, backend, problems = Destination.copy_file(root_path / src_file, src_file, destinations,
+									executor = executor
+								)
+								if dedup and infos['size'] and hash:
+									known_sizes.add(infos['size'])
+					except Exception as ex:
+						log.error(f'Unable to copy source file {src_file}:\n{ex}')
 					else:
-						log.error(f'Source file and {path} are not identical')
-			for src_dir, infos in dirs2zip.items():	# loop to zip files
-				echo(f'Zipping {src_dir} ({counter} of {all_files}, {StringUtils.bytes(infos['size'])})')
-				path = dst_path / src_dir.with_suffix('.zip')
+						counter += 1
+						total_size += infos['size']
+						log.info(f'Copied {src_file} using {backend}', echo=False)
+						if hash:
+							tsv += f'\n{src_file}\t{infos["size"]}\t{hash}'
+						for destination in destinations:
+							if destination in problems:
+								log.error(f'Unable to copy {src_file} to {destination.path}:\n{problems[destination]}')
+							else:
+								destination.add(src_file, infos['size'], hash)
+						key = (infos['size'], hash)
+						if dedup and infos['size'] and hash and not key in known and any(
+							src_file in destination.written for destination in destinations
+						):	# only content that made it to a destination can be referenced
+							known[key] = src_file
+				plain = [destination for destination in destinations if not destination.zipped]
+				for src_dir, infos in dirs2zip.items():	# loop to zip files
+					echo(f'Zipping {src_dir} ({counter} of {all_files}, {StringUtils.bytes(infos['size'])})')
+					zip_file = src_dir.with_suffix('.zip')
+					if plain:	# zip directly into 1st not zipped destination, copy from there to the others
+						path = plain[0].path / zip_file
+					else:	# only zipped destinations, so zip to temporary file
+						path = destinations[0].path.parent / f'{destinations[0].name}.tmp.zip'
+					try:
+						with io_limit:
+							hash, file_errors, dir_errors, saved = PathUtils.zip_dir(root_path  / src_dir, path,
+								links = dedup and self.ZIP_LINKS
+							)
+					except Exception as ex:
+						log.error(f'Unable build archive {path}:\n{ex}')
+					else:
+						counter += 1
+						size = path.stat().st_size
+						total_size += size
+						tsv += f'\n{zip_file}\t{size}\t{hash}'
+						log.info(f'Zipped {src_dir}', echo=False)
+						if saved:
+							log.info(f'Dedup in {zip_file} saved {saved} Bytes ({StringUtils.bytes(saved)})', echo=False)
+						if file_errors:
+							log.warning(f'The following file(s) could not be zipped:\n{"\n".join(file_errors)}')
+						if dir_errors:
+							log.warning(f'The following dir(s) could not be build in zip:\n{"\n".join(dir_errors)}')
+						for destination in destinations:
+							try:
+								if plain and destination is plain[0] or destination.add_file(path, zip_file, hash):
+									destination.add(zip_file, size, hash)
+								else:
+									log.error(f'Archive {path} and copy in {destination.path} are not identical')
+							except Exception as ex:
+								log.error(f'Unable to copy archive {path} to {destination.path}:\n{ex}')
+					if not plain and path.exists():
+						path.unlink()
+				for destination in destinations:	# every destination gets tsv of what it got
+					try:
+						destination.close(self.TSV_NAME)
+					except Exception as ex:
+						log.error(f'Unable to write {self.TSV_NAME} to {destination.path}:\n{ex}')
+				log_tsv = log_path / self.TSV_NAME	# this triggers the surveillance, so write it at last
 				try:
-					hash, file_errors, dir_errors = PathUtils.zip_dir(root_path  / src_dir, path)
+					log_tsv.write_text(tsv, encoding='utf-8')
 				except Exception as ex:
-					log.error(f'Unable build archive {path}:\n{ex}')
+					log.error(f'Unable to write {log_tsv}:\n{ex}')
+				for destination in destinations:
+					log.info(f'Wrote {destination.files} files / {destination.size} Bytes ({StringUtils.bytes(destination.size)}) to {destination.path}')
+					if dedup:
+						log.info(f'Dedup saved {destination.saved} Bytes ({StringUtils.bytes(destination.saved)}) in {destination.path}')
+				if log.close():
+					echo(f'{log.errors} error(s) and {log.warnings} occured while processing {root_path}')
 				else:
-					counter += 1
-					size = path.stat().st_size
-					total_size += size
-					tsv += f'\n{src_dir.with_suffix(".zip")}\t{size}\t{hash}'
-					log.info(f'Zipped {src_dir}', echo=False)
-					if file_errors:
-						log.warning(f'The following file(s) could not be zipped:\n{"\n".join(file_errors)}')
-					if dir_errors:
-						log.warning(f'The following dir(s) could not be build in zip:\n{"\n".join(dir_errors)}')
-			dst_tsv = dst_path / self.TSV_NAME
-			try:
-				dst_tsv.write_text(tsv, encoding='utf-8')
-			except Exception as ex:
-				log.error(f'Unable to write {dst_tsv}:\n{ex}')
-			log_tsv = log_path / self.TSV_NAME
-			try:
-				log_tsv.write_text(tsv, encoding='utf-8')
-			except Exception as ex:
-				log.error(f'Unable to write {log_tsv}:\n{ex}')
-			log.info(f'Wrote {counter-1} files / {total_size} Bytes ({StringUtils.bytes(total_size)}) to {dst_path}')
-			if log.close():
-				echo(f'{log.errors} error(s) and {log.warnings} occured while processing {root_path}')
-			else:
-				echo('Finished successfully')
-				self.exceptions = False
-
-class Worker(Thread):
-	'''Thread that does the work while Tk is running the GUI'''
-
-	def __init__(self, gui):
-		'''Get all attributes from GUI and run Copy'''
-		super().__init__()
-		self.gui = gui
-
-	def run(self):
-		'''Run thread'''
-		copy = Copy(self.gui.source_paths, echo=self.gui.echo)
-		self.gui.finished(copy.exceptions)
+					echo('Finished successfully')
+					succeeded += 1
+			finally:
+				if executor:
+					executor.shutdown()
+				for destination in destinations:	# does nothing if already closed
+					try:
+						destination.close()
+					except Exception as ex:
+						echo(f'Unable to close {destination.path}:\n{ex}')
+				if log:
+					log.close()
+		self.exceptions = succeeded < len(root_dirs)
 
-class Gui(Tk):
-	'''GUI look and feel'''
+class Spool:
+	'''Headless batch mode, copy jobs from spool directory,
+		jobs found as .running on start were interrupted (crash, restart) and are run again
+	'''
 
-	PAD = 4
-	X_FACTOR = 40
-	Y_FACTOR = 30
-	LABEL = __description__
-	GREEN_FG = 'black'
-	GREEN_BG = 'pale green'
-	RED_FG = 'black'
-	RED_BG = 'coral'
-
-	def __init__(self, icon_base64):
-		'''Open application window'''
-		super().__init__()
-		self.worker = None
-		self.title(f'SlowCopy v{__version__}')
-		self.rowconfigure(1, weight=1)
-		self.columnconfigure(1, weight=1)
-		self.rowconfigure(3, weight=1)
-		self.wm_iconphoto(True, PhotoImage(data=icon_base64))
-		self.protocol('WM_DELETE_WINDOW', self._quit_app)
-		font = nametofont('TkTextFont').actual()
-		self.font_family = font['family']
-		self.font_size = font['size']
-		self.min_size_x = self.font_size * self.X_FACTOR
-		self.min_size_y = self.font_size * self.Y_FACTOR
-		self.minsize(self.min_size_x , self.min_size_y)
-		self.geometry(f'{self.min_size_x}x{self.min_size_y}')
-		self.resizable(True, True)
-		self.padding = int(self.font_size / self.PAD)
-		frame = Frame(self)
-		frame.grid(row=0, column=0, columnspan=2, sticky='news',
-			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
-		Label(frame, text=self.LABEL).pack(padx=self.padding, pady=self.padding)
-		frame = Frame(self)
-		frame.grid(row=1, column=0,	sticky='n')
-		self.source_button = Button(frame, text='Source', command=self._add_dir)
-		self.source_button.pack(padx=self.padding, pady=self.padding, fill='x', expand=True)
-		Hovertip(self.source_button, 'Add directory you want to copy')
-		self.source_text = ScrolledText(self, font=(self.font_family, self.font_size),
-			padx = self.padding, pady = self.padding)
-		self.source_text.grid(row=1, column=1, sticky='news',
-			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
-		frame = Frame(self)
-		frame.grid(row=2, column=1, sticky='news', padx=self.padding, pady=self.padding)
-		Label(frame, text='Copy to import directory').pack(padx=self.padding, pady=self.padding, side='left')
-		self.exec_button = Button(frame, text='Execute', command=self._execute)
-		self.exec_button.pack(padx=self.padding, pady=self.padding, side='right')
-		Hovertip(self.exec_button, 'Start copy process')
-		frame = Frame(self)
-		frame.grid(row=3, column=0,	sticky='n')
-		self.clear_button = Button(frame, text='Clear', command=self._clear_info)
-		self.clear_button.pack(padx=self.padding, pady=self.padding, fill='x', expand=True)
-		Hovertip(self.clear_button, 'Clear info field')
-		self.info_text = ScrolledText(self, font=(self.font_family, self.font_size),
-			padx = self.padding, pady = self.padding)
-		self.info_text.grid(row=3, column=1, columnspan=1, sticky='news',
-			ipadx=self.padding, ipady=self.padding, padx=self.padding, pady=self.padding)
-		self.info_text.bind('<Key>', lambda dummy: 'break')
-		self.info_text.configure(state='disabled')
-		self.info_fg = self.info_text.cget('foreground')
-		self.info_bg = self.info_text.cget('background')
-		frame = Frame(self)
-		frame.grid(row=4, column=1, sticky='news', padx=self.padding, pady=self.padding)
-		self.info_label = Label(frame)
-		self.info_label.pack(padx=self.padding, pady=self.padding, side='left')
-		self.label_fg = self.info_label.cget('foreground')
-		self.label_bg = self.info_label.cget('background')
-		self.quit_button = Button(frame, text='Quit', command=self._quit_app)
-		self.quit_button.pack(padx=self.padding, pady=self.padding, side='right')
-		self._init_warning()
-
-	def _add_dir(self):
-		'''Add directory into field'''
-		directory = askdirectory(title='Select directory to copy', mustexist=True)
-		if directory:
-			self.source_text.insert('end', f'{directory}\n')
-
-	def echo(self, *arg):
-		'''Write message to info field (ScrolledText)'''
-		msg = ' '.join(arg)
-		self.info_text.configure(state='normal')
-		self.info_text.insert('end', f'{msg}\n')
-		self.info_text.configure(state='disabled')
-		self.info_text.yview('end')
-
-	def _clear_info(self):
-		'''Clear info text'''
-		self.info_text.configure(state='normal')
-		self.info_text.delete('1.0', 'end')
-		self.info_text.configure(state='disabled')
-		self.info_text.configure(foreground=self.info_fg, background=self.info_bg)
-		self._warning_state = 'stop'
-
-	def _execute(self):
-		'''Start copy process / worker'''
-		source_paths = self.source_text.get('1.0', 'end').strip()
-		if not source_paths:
-			return
-		self.source_button.configure(state='disabled')
-		self.source_text.configure(state='disabled')
-		self.exec_button.configure(state='disabled')
-		self._clear_info()
-		self.quit_button.configure(state='disabled')
-		self.source_paths = source_paths.split('\n')
-		self.worker = Worker(self)
-		self.worker.start()
+	### hard coded configuration ###
+	JOB_SUFFIX = '.job'	# job file: 1st line department, following lines source directories,
+						# write it as *.tmp and rename it to *.job when complete, so it is not read half written
+	RUNNING_SUFFIX = '.running'	# job file is renamed to this while copying
+	DONE_SUFFIX = '.done'	# and to this when copying finished without problems
+	FAILED_SUFFIX = '.failed'	# or to this when problems occured
+	STATUS_SUFFIX = '.status'	# status file to follow the job
+	MAX_JOBS = 4	# number of jobs to run concurrently
+	MAX_IO = 4	# number of files to copy/zip concurrently over all jobs
+	INTERVAL = 10	# seconds to wait before looking for new jobs
 
-	def _init_warning(self):
-		'''Init warning functionality'''
-		self._warning_state = 'disabled'
-		self._warning()
+	def __init__(self, spool_path, echo=print):
+		'''Set spool directory and global limits'''
+		from threading import BoundedSemaphore	# import here to keep cli startup lean
+		self.spool_path = spool_path
+		self.echo = echo
+		self.io_limit = BoundedSemaphore(self.MAX_IO)
 
-	def _warning(self):
-		'''Show flashing warning'''
-		if self._warning_state == 'enable':
-			self.info_label.configure(text='WARNING')
-			self._warning_state = '1'
-		if self._warning_state == '1':
-			self.info_label.configure(foreground=self.RED_FG, background=self.RED_BG)
-			self._warning_state = '2'
-		elif self._warning_state == '2':
-			self.info_label.configure(foreground=self.label_fg, background=self.label_bg)
-			self._warning_state = '1'
-		elif self._warning_state != 'disabled':
-			self.info_label.configure(text= '', foreground=self.label_fg, background=self.label_bg)
-			self._warning_state = 'disabled'
-		self.after(500, self._warning)
+	def _new_jobs(self):
+		'''Return job files in spool directory, oldest first'''
+		jobs = list()
+		for job_path in self.spool_path.glob(f'*{self.JOB_SUFFIX}'):
+			try:
+				jobs.append((job_path.stat().st_mtime, job_path))
+			except FileNotFoundError:	# claimed or removed meanwhile
+				pass
+		return [job_path for mtime, job_path in sorted(jobs)]
 
-	def finished(self, exceptions):
-		'''Run this when Worker has finished'''
-		self.source_text.configure(state='normal')
-		self.source_text.delete('1.0', 'end')
-		self.source_button.configure(state='normal')
-		self.exec_button.configure(state='normal')
-		self.quit_button.configure(state='normal')
-		self.worker = None
-		if exceptions:
-			self.info_text.configure(foreground=self.RED_FG, background=self.RED_BG)
-			self._warning_state = 'enable'
-			showerror(title='Warning', message='Problems occured!')
-		else:
-			self.info_text.configure(foreground=self.GREEN_FG, background=self.GREEN_BG)
+	def _run_job(self, job_path):
+		'''Run one job, job file has to be renamed to .running before'''
+		from datetime import datetime
+		status_path = job_path.with_suffix(self.STATUS_SUFFIX)
+		with status_path.open(mode='w', buffering=1, encoding='utf-8') as status_fh:
+			def echo(*args):	# status file gets the messages the gui would show
+				print(datetime.now().strftime('%Y-%m-%d %H:%M:%S'), *args, file=status_fh)
+			try:
+				lines = [line.strip() for line in job_path.read_text(encoding='utf-8').split('\n') if line.strip()]
+				department = lines[0]
+				if Path(department).name != department or department in ('.', '..'):
+					raise ValueError(f'Invalid department {department}')
+				if len(lines) < 2:
+					raise ValueError('No source directory given')
+				echo(f'Starting job for department {department}')
+				copy = Copy(lines[1:], echo=echo,
+					dst_path = Copy.DST_PATH.parent / department,
+					log_path = Copy.LOG_PATH.parent / department,
+					backup_path = Copy.BACKUP_PATH.parent / department if Copy.BACKUP_PATH else None,
+					io_limit = self.io_limit
+				)
+				exceptions = copy.exceptions
+			except Exception as ex:
+				echo(f'ERROR: {ex}')
+				exceptions = True
+			if exceptions:
+				echo('FAILED')
+				job_path.rename(job_path.with_suffix(self.FAILED_SUFFIX))
+			else:
+				echo('FINISHED')
+				job_path.rename(job_path.with_suffix(self.DONE_SUFFIX))
+		self.echo(f'{job_path.stem}: {"failed" if exceptions else "finished"}')
 
-	def _quit_app(self):
-		'''Quit app, ask when copy processs is running'''
-		if self.worker and not askyesno(
-			title='Copy process is running!',
-			message='Are you sure to kill copy process / application?'
-		):
-			return
-		self.destroy()
+	def run(self):
+		'''Watch spool directory endlessly'''
+		from concurrent.futures import ThreadPoolExecutor
+		from time import sleep
+		self.echo(f'Watching {self.spool_path} for {self.JOB_SUFFIX} files')
+		try:
+			for running_path in self.spool_path.glob(f'*{self.RUNNING_SUFFIX}'):	# copying overwrites, so just run again
+				self.echo(f'{running_path.stem}: interrupted, will be run again')
+				running_path.rename(running_path.with_suffix(self.JOB_SUFFIX))
+		except Exception as ex:
+			self.echo(f'ERROR: unable to requeue interrupted jobs:\n{ex}')
+		running = dict()	# future: job file
+		with ThreadPoolExecutor(max_workers=self.MAX_JOBS) as executor:
+			while True:
+				for future, running_path in list(running.items()):
+					if future.done():
+						del running[future]
+						if future.exception():	# e.g. status file could not be written or job file not be renamed
+							self.echo(f'{running_path.stem}: ERROR {future.exception()}')
+				try:	# spool directory might be unreachable for a while
+					for job_path in self._new_jobs()[:self.MAX_JOBS - len(running)]:
+						running_path = job_path.with_suffix(self.RUNNING_SUFFIX)
+						try:	# claim job by renaming
+							job_path.rename(running_path)
+						except OSError:
+							continue
+						self.echo(f'{job_path.stem}: started')
+						running[executor.submit(self._run_job, running_path)] = running_path
+				except Exception as ex:
+					self.echo(f'ERROR: {ex}')
+				sleep(self.INTERVAL)
 
 if __name__ == '__main__':  # start here when run as application
-	if len(sys_argv) > 1:	# when arguments / dirs are given, run on command line
+	if len(sys_argv) == 3 and sys_argv[1] == '--spool':	# run headless as daemon on spool directory
+		Spool(Path(sys_argv[2])).run()
+	elif len(sys_argv) > 1:	# when arguments / dirs are given, run on command line
 		copy = Copy(sys_argv[1:])
 		if copy.exceptions:	# exit code 0 when there are any exceptions
 			sys_exit(1)
 		sys_exit(0)
-	else:	# open gui if no argument is given
-		Gui('''iVBORw0KGgoAAAANSUhEUgAAADAAAAAwCAMAAABg3Am1AAACEFBMVEUAAAH7AfwVFf8WFv4XF/0Y
+	else:	# open gui if no argument is given, tk is only imported here to start fast on cmd line
+		try:
+			from lib.slowcopygui import Gui
+		except ImportError:	# lean build without tk, only cmd line
+			print(f'Usage: {Path(sys_argv[0]).name} SOURCE_DIR [SOURCE_DIR ...] | --spool SPOOL_DIR')
+			sys_exit(2)
+		Gui(Copy, f'SlowCopy v{__version__}', __description__, '''iVBORw0KGgoAAAANSUhEUgAAADAAAAAwCAMAAABg3Am1AAACEFBMVEUAAAH7AfwVFf8WFv4XF/0Y
 GPwZGfwaGvsaGvwbG/scHPodHfkeHvkfH/kgIPggIPkhIfciIvYjI/UkJPUlJfQnJ/IoKPEpKfAq
 KvArK+4rK+8sLO4tLewtLe0uLusuLuwvL+swMOoxMegxMekyMuczM+UzM+Y0NOQ0NOU1NeM1NeQ1
 NeU2NuE2NuI2NuM3N+A3N+E4ON85Od45Od86Otw6Ot07O9o7O9s8PNk8PNs9Pdg9Pdk+PtY+Ptc/
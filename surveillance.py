@@ -10,7 +10,10 @@ __description__ = 'Watch copy processes'
 
 ### Standard libs ###
 import logging
+from os import scandir
+from stat import S_ISREG
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from zipfile import ZipFile, ZIP_DEFLATED
 from shutil import rmtree
 from time import sleep
@@ -18,6 +21,7 @@ from datetime import datetime
 from argparse import ArgumentParser
 ### Custom libs ###
 from lib.pathutils import PathUtils
+from lib.zipindex import ZipIndex
 from lib.stringutils import StringUtils
 from lib.configreader import ConfigReader
 from lib.advancedlogger import Logger
@@ -62,54 +66,91 @@ class Directory:
 		'''Check for file that tells that copy process has finished'''
 		return self.path.joinpath(config.work_ready).exists()
 
+	def _stat(self, rel_path):
+		'''Return stat of file or None if it does not exist'''
+		try:
+			return (self.path/rel_path).stat()
+		except OSError:
+			return None
+
+	def _scan(self, path):
+		'''Recursivly give relative paths of all files (as posix strings) using scandir'''
+		with scandir(path) as entries:
+			for entry in entries:
+				if entry.is_dir(follow_symlinks=False):
+					yield from self._scan(entry.path)
+				elif entry.is_file():
+					yield Path(entry.path).relative_to(self.path).as_posix()
+
+	def extra_files(self, sizes):
+		'''Return files in directory that are not in the given files'''
+		expected = {rel_path.as_posix() for rel_path in sizes} | {config.work_ready, config.trigger_filename}
+		return sorted(set(self._scan(self.path)) - expected)
+
 	def check(self, sizes, hashes):
 		'''Check if files exists, file sizes and hashes are matching'''
 		logging.debug(f'Checking {self.path} for new entries/directories')
-		self.files = {	# all (recursivly) file paths in the directory
-			path for path in self.path.rglob('*')
-			if path.is_file()
-		}
+		with ThreadPoolExecutor(max_workers=getattr(config, 'check_threads', 16)) as executor:	# hide network latency
+			stats = dict(zip(sizes, executor.map(self._stat, sizes)))
 		warning_cnt = 0
-		for rel_path in sizes:	# loop given files (sizes+hashes) and check for mismatches in directory
+		for rel_path, stat in stats.items():	# loop given files (sizes+hashes) and check for mismatches in directory
 			abs_path = self.path/rel_path
-			if not abs_path in self.files:
+			if not stat or not S_ISREG(stat.st_mode):
 				logging.warning(f'Did not find {rel_path} in {self.path}')
 				warning_cnt += 1
-			elif abs_path.stat().st_size != sizes[rel_path]:
+			elif stat.st_size != sizes[rel_path]:
 				logging.warning(f'Mismatching file size of {abs_path}')
 				warning_cnt += 1
-			elif PathUtils.hash_file(abs_path) != hashes[rel_path]:
+			elif PathUtils.hash_file(abs_path, block_size=getattr(config, 'check_block_size', 0) or None) != hashes[rel_path]:
 				logging.warning(f'Mismatching hash value of {abs_path}')
 				warning_cnt += 1
+		if getattr(config, 'check_extras', False):	# optional, this has to read the whole directory tree
+			for rel_path in self.extra_files(sizes):
+				logging.warning(f'Found unexpected file {rel_path} in {self.path}')
+				warning_cnt += 1
 		return warning_cnt	# return number of warnings / mismatching files
 
 class Archive:
 	'''Zip archive to surveil'''
 
 	def __init__(self, path):
-		'''Open archive to read'''
+		'''Open archive to read, use cached index of members if archive did not change'''
 		self.path = path
-		self._zipfile = ZipFile(self.path)
+		self.index = ZipIndex(self.path, cache_dir=getattr(config, 'cache_dir', None))
+		logging.debug(f'{"Loaded cached" if self.index.cached else "Read"} index of {self.path}')
+		self._zipfile = None	# only needed for members ZipIndex can not read
+
+	def _hash(self, name, size):
+		'''Calculate SHA256 of member'''
+		block_size = getattr(config, 'check_block_size', 0) or None	# 0 or None to auto-tune
+		if self.index.can_open(name):
+			return PathUtils.hash_stream(self.index.open(name), size, block_size=block_size)
+		if not self._zipfile:
+			self._zipfile = ZipFile(self.path)
+		return PathUtils.hash_zip(self._zipfile, Path(self.index.resolve(name)), block_size=block_size)
 
 	def check(self, sizes, hashes):
 		'''Check if files exists, file sizes and hashes are matching'''
 		dir_path = Path(self.path.stem)
-		self.members = {	# all (recursivly) members with file sizes of the zip archive
-			Path(member.filename): member.file_size for member in self._zipfile.infolist()
-		}
 		warning_cnt = 0
-		for rel_path in sizes:	# loop given files (sizes+hashes) and check for mismatches in directory
-			in_zip_path = dir_path/rel_path
-			if not in_zip_path in self.members:
-				logging.warning(f'Did not find {in_zip_path} in {self.path}')
-				warning_cnt += 1
-			elif self.members[in_zip_path] != sizes[rel_path]:
-				logging.warning(f'Mismatching file size of {in_zip_path} in {self.path}')
-				warning_cnt += 1
-			else:
-				if PathUtils.hash_zip(self._zipfile, in_zip_path) != hashes[rel_path]:
-					logging.warning(f'Mismatching hash value of {in_zip_path} in {self.path}')
+		try:
+			for rel_path in sizes:	# loop given files (sizes+hashes) and check for mismatches in directory
+				in_zip_path = dir_path/rel_path
+				size = self.index.size(in_zip_path.as_posix())
+				if size is None:
+					logging.warning(f'Did not find {in_zip_path} in {self.path}')
+					warning_cnt += 1
+				elif size != sizes[rel_path]:
+					logging.warning(f'Mismatching file size of {in_zip_path} in {self.path}')
 					warning_cnt += 1
+				else:
+					if self._hash(in_zip_path.as_posix(), size) != hashes[rel_path]:
+						logging.warning(f'Mismatching hash value of {in_zip_path} in {self.path}')
+						warning_cnt += 1
+		finally:
+			self.index.close()
+			if self._zipfile:
+				self._zipfile.close()
 		return warning_cnt	# return number of warnings / mismatching files
 
 class Check: